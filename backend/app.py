@@ -18,6 +18,7 @@ from routes.cases import cases_bp
 from routes.fhir import fhir_bp
 from routes.predictions import predictions_bp
 from utils.rbac import require_permission, get_rbac_info
+from utils.ml_model import get_predictor
 
 # Create Flask app
 app = Flask(__name__)
@@ -74,6 +75,13 @@ app.register_blueprint(cases_bp)
 app.register_blueprint(fhir_bp)
 app.register_blueprint(predictions_bp)
 
+# ===== ML MODEL WARM-UP =====
+# Load the model into memory at startup so no prediction request pays the load cost
+try:
+    get_predictor()
+except Exception as e:
+    print(f"⚠️  ML model not loaded at startup (will retry on first prediction): {e}")
+
 # ===== ROOT ENDPOINTS =====
 @app.route('/')
 def index():
@@ -101,6 +109,7 @@ def index():
             "fhir_observation": "/api/fhir/observation?country={country}&date={date}",
             "fhir_capability": "/api/fhir/capability",
             "predict_mortality": "/api/predictions/mortality (POST)",
+            "predict_mortality_batch": "/api/predictions/mortality/batch (POST)",
             "model_performance": "/api/predictions/model-performance",
             "rbac_info": "/api/security/rbac",
             "rbac_test": "/api/security/test-rbac"
@@ -332,6 +341,7 @@ if __name__ == '__main__':
     
     print(f"\n   Predictions (ML):")
     print(f"   • Mortality (POST):     /api/predictions/mortality")
+    print(f"   • Batch (POST):         /api/predictions/mortality/batch")
     print(f"   • Model Performance:    /api/predictions/model-performance")
     
     print(f"\n   Security (RBAC):")
@@ -0,0 +1,37 @@
+"""
+ONNX Export Script
+Convert the trained Random Forest to ONNX for fast inference with onnxruntime
+
+Modul 4: Clinical Decision Support Systems
+
+Run after train_model.py (from the backend directory):
+    python export_onnx.py
+"""
+
+import pickle
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+print("="*70)
+print("📦 EXPORT MORTALITY MODEL TO ONNX")
+print("="*70)
+
+with open('models/mortality_model.pkl', 'rb') as f:
+    model = pickle.load(f)
+
+with open('models/feature_columns.pkl', 'rb') as f:
+    feature_columns = pickle.load(f)
+
+print(f"\n🔧 Converting model ({len(feature_columns)} features)...")
+
+# zipmap=False keeps probabilities as a plain (n_samples, n_classes) array
+onnx_model = convert_sklearn(
+    model,
+    initial_types=[("input", FloatTensorType([None, len(feature_columns)]))],
+    options={id(model): {"zipmap": False}}
+)
+
+with open('models/mortality_model.onnx', 'wb') as f:
+    f.write(onnx_model.SerializeToString())
+
+print("✅ ONNX model saved to models/mortality_model.onnx")
@@ -16,10 +16,13 @@ def get_country_cases(country):
     Query params:
         - start_date: YYYY-MM-DD
         - end_date: YYYY-MM-DD
+        - orient: records|columns (default: records)
+          columns returns data as {"date": [...], "confirmed": [...], ...}
     """
     try:
         start_date = request.args.get('start_date', None)
         end_date = request.args.get('end_date', None)
+        orient = request.args.get('orient', 'records')
         
         query = """
         SELECT 
@@ -49,22 +52,35 @@ def get_country_cases(country):
         if not results:
             return jsonify({"error": f"No data found for country: {country}"}), 404
         
-        cases_data = []
-        for row in results:
-            data_point = {
-                "date": row['date'].strftime('%Y-%m-%d'),
-                "country": row['country_region'],
-                "confirmed": row['confirmed'],
-                "deaths": row['deaths'],
-                "recovered": row['recovered'],
-                "active": row['active']
+        if orient == 'columns':
+            # Columnar payload: keys are sent once instead of once per day.
+            # SUM() yields Decimal (serialized as strings) or NULL, so counts are
+            # sent as plain ints and clients can build typed arrays directly
+            cases_data = {
+                "date": [row['date'].strftime('%Y-%m-%d') for row in results],
+                "country": [row['country_region'] for row in results],
+                "confirmed": [int(row['confirmed'] or 0) for row in results],
+                "deaths": [int(row['deaths'] or 0) for row in results],
+                "recovered": [int(row['recovered'] or 0) for row in results],
+                "active": [int(row['active'] or 0) for row in results]
             }
-            cases_data.append(data_point)
+        else:
+            cases_data = []
+            for row in results:
+                data_point = {
+                    "date": row['date'].strftime('%Y-%m-%d'),
+                    "country": row['country_region'],
+                    "confirmed": row['confirmed'],
+                    "deaths": row['deaths'],
+                    "recovered": row['recovered'],
+                    "active": row['active']
+                }
+                cases_data.append(data_point)
         
         response = {
             "status": "success",
             "country": country,
-            "count": len(cases_data),
+            "count": len(results),
             "data": cases_data
         }
         
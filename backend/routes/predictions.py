@@ -12,6 +12,9 @@ import traceback
 
 predictions_bp = Blueprint('predictions', __name__, url_prefix='/api/predictions')
 
+# Upper bound on inputs per /mortality/batch request
+MAX_BATCH_SIZE = 500
+
 @predictions_bp.route('/mortality', methods=['POST'])
 def predict_mortality():
     """
@@ -85,6 +88,82 @@ def predict_mortality():
         }), 500
 
 
+@predictions_bp.route('/mortality/batch', methods=['POST'])
+def predict_mortality_batch():
+    """
+    Predict COVID-19 mortality risk for several scenarios in one call
+    
+    Request body (JSON):
+    {
+        "inputs": [
+            {"confirmed": 1000, "deaths": 50, ...},
+            {"confirmed": 5000, "deaths": 400, ...}
+        ]
+    }
+    Each input takes the same fields as /mortality (at most MAX_BATCH_SIZE inputs).
+    
+    Returns:
+        JSON with one prediction per input, in request order
+    """
+    try:
+        # silent=True: malformed JSON or a non-JSON content type yields None (400 below)
+        data = request.get_json(silent=True)
+        inputs = data.get('inputs') if isinstance(data, dict) else None
+        
+        if not inputs or not isinstance(inputs, list):
+            return jsonify({
+                "status": "error",
+                "message": "Request body must be a JSON object with a non-empty 'inputs' list"
+            }), 400
+        
+        if len(inputs) > MAX_BATCH_SIZE:
+            return jsonify({
+                "status": "error",
+                "message": f"Too many inputs: {len(inputs)} (maximum {MAX_BATCH_SIZE})"
+            }), 400
+        
+        # Validate required fields per input
+        required_fields = ['confirmed', 'deaths']
+        for i, row in enumerate(inputs):
+            if not isinstance(row, dict):
+                return jsonify({
+                    "status": "error",
+                    "message": f"Input {i}: must be a JSON object"
+                }), 400
+            
+            missing_fields = [field for field in required_fields if field not in row]
+            if missing_fields:
+                return jsonify({
+                    "status": "error",
+                    "message": f"Input {i}: missing required fields: {', '.join(missing_fields)}"
+                }), 400
+        
+        # Get predictor
+        predictor = get_predictor()
+        
+        # Score all inputs with a single model call
+        predictions = predictor.predict_batch(inputs)
+        
+        return jsonify({
+            "status": "success",
+            "count": len(predictions),
+            "predictions": predictions,
+            "model_info": {
+                "type": "Random Forest Classifier",
+                "features_count": len(predictor.feature_columns),
+                "training_accuracy": predictor.metrics.get('accuracy', 0)
+            }
+        }), 200
+        
+    except Exception as e:
+        error_details = traceback.format_exc()
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "details": error_details if request.args.get('debug') else None
+        }), 500
+
+
 @predictions_bp.route('/model-performance', methods=['GET'])
 def get_model_performance():
     """
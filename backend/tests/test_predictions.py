@@ -0,0 +1,50 @@
+"""
+Tests for request validation on /api/predictions/mortality/batch
+"""
+
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from routes.predictions import predictions_bp, MAX_BATCH_SIZE
+
+BATCH_URL = '/api/predictions/mortality/batch'
+
+
+@pytest.fixture
+def client():
+    app = flask.Flask(__name__)
+    app.register_blueprint(predictions_bp)
+    return app.test_client()
+
+
+def test_malformed_json_returns_400(client):
+    response = client.post(BATCH_URL, data='{bad', content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
+
+
+def test_wrong_content_type_returns_400(client):
+    response = client.post(BATCH_URL, data='{"inputs": []}', content_type='text/plain')
+    assert response.status_code == 400
+
+
+def test_json_array_body_returns_400(client):
+    response = client.post(BATCH_URL, json=[{"confirmed": 1, "deaths": 0}])
+    assert response.status_code == 400
+
+
+def test_non_object_input_returns_400(client):
+    response = client.post(BATCH_URL, json={"inputs": [1]})
+    assert response.status_code == 400
+
+
+def test_missing_fields_returns_400(client):
+    response = client.post(BATCH_URL, json={"inputs": [{"confirmed": 1}]})
+    assert response.status_code == 400
+
+
+def test_oversized_batch_returns_400(client):
+    rows = [{"confirmed": 1, "deaths": 0}] * (MAX_BATCH_SIZE + 1)
+    response = client.post(BATCH_URL, json={"inputs": rows})
+    assert response.status_code == 400
@@ -8,6 +8,12 @@ Modul 4: Clinical Decision Support Systems
 import pickle
 import numpy as np
 import os
+import threading
+
+try:
+    import onnxruntime as ort
+except ImportError:  # onnxruntime is optional - fall back to sklearn inference
+    ort = None
 
 class MortalityPredictor:
     """Wrapper class for mortality prediction model"""
@@ -17,6 +23,7 @@ class MortalityPredictor:
         self.scaler = None
         self.feature_columns = None
         self.metrics = None
+        self.onnx_session = None
         self.load_model()
     
     def load_model(self):
@@ -26,6 +33,7 @@ class MortalityPredictor:
             features_path = 'models/feature_columns.pkl'
             metrics_path = 'models/model_metrics.pkl'
             scaler_path = 'models/scaler.pkl'
+            onnx_path = 'models/mortality_model.onnx'
             
             if not os.path.exists(model_path):
                 raise FileNotFoundError(f"Model file not found: {model_path}")
@@ -44,6 +52,14 @@ class MortalityPredictor:
                 with open(scaler_path, 'rb') as f:
                     self.scaler = pickle.load(f)
             
+            # Use the ONNX export (see export_onnx.py) if available and not older than the pickle
+            if ort is not None and os.path.exists(onnx_path):
+                if os.path.getmtime(onnx_path) < os.path.getmtime(model_path):
+                    print("⚠️  ONNX model is older than mortality_model.pkl (re-run export_onnx.py); using sklearn")
+                else:
+                    self.onnx_session = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+                    print("✅ ONNX Runtime session ready")
+            
             print("✅ ML Model loaded successfully")
             print(f"   Expected features: {len(self.feature_columns)}")
             
@@ -51,10 +67,14 @@ class MortalityPredictor:
             print(f"❌ Error loading model: {e}")
             raise
     
-    def prepare_features(self, data):
+    def prepare_features(self, data, scale=True):
         """
         Prepare features for prediction (UPDATED to match training)
         
+        Args:
+            data (dict): Input data
+            scale (bool): Apply the fitted scaler (batch callers scale all rows at once)
+        
         Features (19 total):
         1-4: confirmed_lag2, deaths_lag2, recovered_lag2, active_lag2
         5-7: confirmed_change_2d, deaths_change_2d, recovered_change_2d
@@ -131,7 +151,7 @@ class MortalityPredictor:
         ]])
         
         # Apply scaling if scaler exists
-        if self.scaler is not None:
+        if scale and self.scaler is not None:
             features = self.scaler.transform(features)
         
         return features
@@ -151,52 +171,96 @@ class MortalityPredictor:
             features = self.prepare_features(data)
             
             # Get prediction
-            prediction = self.model.predict(features)[0]
-            prediction_proba = self.model.predict_proba(features)[0]
+            prediction_proba = self._predict_proba(features)[0]
+            prediction = self.model.classes_[prediction_proba.argmax()]
+            
+            return self._format_result(data, prediction, prediction_proba)
             
-            risk_score = prediction_proba[1]  # Probability of high risk
+        except Exception as e:
+            print(f"❌ Prediction error: {e}")
+            raise
+    
+    def predict_batch(self, rows):
+        """
+        Make mortality risk predictions for several inputs at once
+        
+        All rows are scaled and scored with a single predict_proba call,
+        so per-call model overhead is paid once for the whole batch.
+        
+        Args:
+            rows (list of dict): Input data, same keys as predict()
+        
+        Returns:
+            list of dict: Prediction results, in input order
+        """
+        try:
+            features = np.vstack([self.prepare_features(data, scale=False) for data in rows])
             
-            # Classify risk level
-            if risk_score > 0.7:
-                risk_level = "HIGH"
-                risk_color = "red"
-                recommendation = "⚠️ High mortality risk detected. Enhanced surveillance and resource allocation recommended. Implement aggressive public health interventions."
-            elif risk_score > 0.4:
-                risk_level = "MEDIUM"
-                risk_color = "orange"
-                recommendation = "⚠️ Moderate mortality risk. Continue monitoring outbreak patterns closely. Prepare contingency plans and ensure healthcare capacity."
-            else:
-                risk_level = "LOW"
-                risk_color = "green"
-                recommendation = "✅ Low mortality risk. Maintain standard surveillance protocols. Continue preventive measures and public health education."
+            if self.scaler is not None:
+                features = self.scaler.transform(features)
             
-            # Calculate mortality rate from input
-            mortality_rate = (data.get('deaths', 0) / data.get('confirmed', 1) * 100) if data.get('confirmed', 0) > 0 else 0
+            probas = self._predict_proba(features)
+            predictions = self.model.classes_[probas.argmax(axis=1)]
             
-            return {
-                'prediction': int(prediction),
-                'risk_score': float(risk_score),
-                'risk_level': risk_level,
-                'risk_color': risk_color,
-                'confidence': float(max(prediction_proba)),
-                'recommendation': recommendation,
-                'mortality_rate': float(mortality_rate)
-            }
+            return [
+                self._format_result(data, prediction, proba)
+                for data, prediction, proba in zip(rows, predictions, probas)
+            ]
             
         except Exception as e:
-            print(f"❌ Prediction error: {e}")
+            print(f"❌ Batch prediction error: {e}")
             raise
     
+    def _predict_proba(self, features):
+        """Class probabilities from ONNX Runtime if loaded, else from sklearn"""
+        if self.onnx_session is not None:
+            return self.onnx_session.run(None, {"input": features.astype(np.float32)})[1]
+        return self.model.predict_proba(features)
+    
+    def _format_result(self, data, prediction, prediction_proba):
+        """Classify risk level and build the prediction result dict"""
+        risk_score = prediction_proba[1]  # Probability of high risk
+        
+        # Classify risk level
+        if risk_score > 0.7:
+            risk_level = "HIGH"
+            risk_color = "red"
+            recommendation = "⚠️ High mortality risk detected. Enhanced surveillance and resource allocation recommended. Implement aggressive public health interventions."
+        elif risk_score > 0.4:
+            risk_level = "MEDIUM"
+            risk_color = "orange"
+            recommendation = "⚠️ Moderate mortality risk. Continue monitoring outbreak patterns closely. Prepare contingency plans and ensure healthcare capacity."
+        else:
+            risk_level = "LOW"
+            risk_color = "green"
+            recommendation = "✅ Low mortality risk. Maintain standard surveillance protocols. Continue preventive measures and public health education."
+        
+        # Calculate mortality rate from input
+        mortality_rate = (data.get('deaths', 0) / data.get('confirmed', 1) * 100) if data.get('confirmed', 0) > 0 else 0
+        
+        return {
+            'prediction': int(prediction),
+            'risk_score': float(risk_score),
+            'risk_level': risk_level,
+            'risk_color': risk_color,
+            'confidence': float(max(prediction_proba)),
+            'recommendation': recommendation,
+            'mortality_rate': float(mortality_rate)
+        }
+    
     def get_metrics(self):
         """Get model performance metrics"""
         return self.metrics
 
 # Global predictor instance
 predictor = None
+_predictor_lock = threading.Lock()
 
 def get_predictor():
-    """Get or create predictor instance"""
+    """Get or create predictor instance (loaded once, shared by all request threads)"""
     global predictor
     if predictor is None:
-        predictor = MortalityPredictor()
+        with _predictor_lock:
+            if predictor is None:
+                predictor = MortalityPredictor()
     return predictor
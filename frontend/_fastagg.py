@@ -0,0 +1,47 @@
+"""
+Fast Numeric Aggregations for the Dashboard
+JIT-compiled kernels for per-row time series math
+
+Modul 7: Data Analytics & BI
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to plain Python
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def rolling_mean(x, w):
+    """
+    Trailing rolling mean using a running-sum window
+
+    Args:
+        x: 1-D float64 array (e.g. cumulative confirmed cases)
+        w: Window size in samples (e.g. 7 for a weekly average)
+
+    Returns:
+        float64 array of len(x); the first w-1 entries are NaN,
+        matching pandas' Series.rolling(w).mean()
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    window_sum = 0.0
+
+    for i in range(n):
+        window_sum += x[i]
+        if i >= w:
+            window_sum -= x[i - w]
+
+        if i >= w - 1:
+            out[i] = window_sum / w
+        else:
+            out[i] = np.nan
+
+    return out
@@ -0,0 +1,62 @@
+"""
+Time Series Figures for the Dashboard
+Downsampled Plotly figures for long per-day series
+
+Modul 7: Data Analytics & BI
+"""
+
+# Longer time series are downsampled (MinMaxLTTB) to this many points per trace
+MAX_PLOT_POINTS = 2000
+
+# Trace types FigureResampler can aggregate from hf_x/hf_y; others (e.g. bar)
+# come back empty, so they always get explicit x/y
+RESAMPLED_TRACE_TYPES = ("scatter", "scattergl")
+
+
+def new_timeseries_figure():
+    """
+    Create a figure for long time series
+
+    Uses plotly-resampler's FigureResampler (MinMaxLTTB, MAX_PLOT_POINTS per trace)
+    when installed, so only a downsampled view of each trace is serialized to the
+    browser. Falls back to a plain go.Figure otherwise.
+    """
+    import plotly.graph_objects as go
+    try:
+        from plotly_resampler import FigureResampler
+        from plotly_resampler.aggregation import MinMaxLTTB
+    except ImportError:
+        return go.Figure()
+    return FigureResampler(
+        go.Figure(),
+        default_downsampler=MinMaxLTTB(),
+        default_n_shown_samples=MAX_PLOT_POINTS
+    )
+
+
+def add_timeseries_trace(fig, trace, x, y):
+    """
+    Add a trace to a figure from new_timeseries_figure() with full-resolution x/y data
+
+    Scatter traces on a FigureResampler are handed over as hf_x/hf_y. Everything
+    else (plain go.Figure, bar traces) gets explicit x/y, reduced to
+    MAX_PLOT_POINTS with tsdownsample's MinMaxLTTB when the series is longer.
+    """
+    if hasattr(fig, 'hf_data') and trace.type in RESAMPLED_TRACE_TYPES:
+        fig.add_trace(trace, hf_x=x, hf_y=y)
+        return
+
+    if len(x) > MAX_PLOT_POINTS:
+        try:
+            from tsdownsample import MinMaxLTTBDownsampler
+        except ImportError:
+            pass
+        else:
+            import numpy as np
+            x = np.asarray(x)
+            y = np.asarray(y)
+            idx = MinMaxLTTBDownsampler().downsample(x.astype('int64'), y, n_out=MAX_PLOT_POINTS)
+            x, y = x[idx], y[idx]
+
+    trace.update(x=x, y=y)
+    fig.add_trace(trace)
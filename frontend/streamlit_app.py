@@ -8,19 +8,67 @@ Modul 7: Data Analytics & BI
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+import orjson
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import time
-import numpy as np 
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # ===== CONFIGURATION =====
 # Use 127.0.0.1 instead of localhost for better Windows compatibility
 API_BASE_URL = "http://127.0.0.1:5000/api"
 API_ROOT = "http://127.0.0.1:5000"
 
+# POST bodies are pre-encoded with orjson, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Shared layout for the Predictive Analytics figures (template comes from get_dark_template())
+DARK_LAYOUT = {"height": 500, "hovermode": "closest"}
+ROC_LEGEND = dict(yanchor="bottom", y=0.01, xanchor="right", x=0.99)
+
+# Random-classifier diagonal for the ROC chart (plain trace dict, so Plotly stays lazily imported)
+RANDOM_BASELINE = dict(
+    type='scatter',
+    x=[0, 1],
+    y=[0, 1],
+    mode='lines',
+    name='Random Classifier (AUC = 0.500)',
+    line=dict(color='red', width=2, dash='dash')
+)
+
+# Gray placeholder box shown where a figure will appear (same height as DARK_LAYOUT)
+CHART_SKELETON = "<div style='height:500px;background:#222;border-radius:8px'></div>"
+
+# Risk banner HTML per risk color (API returns red/orange/green); filled with .format()
+RISK_HTML = {
+    c: (
+        "<div style='background-color: %s; padding: 30px; border-radius: 15px; text-align: center;'>"
+        "<h1 style='color: white; margin: 0;'>{emoji} {level} RISK</h1>"
+        "<h2 style='color: white; margin: 10px 0 0 0;'>Risk Score: {score}</h2>"
+        "</div>"
+    ) % c
+    for c in ("red", "orange", "green")
+}
+
+# WHO regions in model encoding order (who_region_encoded = position)
+REGIONS = ("Americas", "Europe", "Western Pacific", "Eastern Mediterranean",
+           "South-East Asia", "Africa", "Unknown")
+
+# Risk color -> emoji for the prediction banner
+RISK_EMOJI = {"red": "🔴", "orange": "🟡", "green": "🟢"}
+
+# Column dtypes for /api/cases/country?orient=columns time series (counts sent as ints)
+COUNTRY_SCHEMA = {
+    'confirmed': 'int64',
+    'deaths': 'int64',
+    'recovered': 'int64',
+    'active': 'int64'
+}
+
 # ===== PAGE CONFIGURATION =====
 st.set_page_config(
     page_title="COVID-19 Public Health Dashboard",
@@ -65,10 +113,20 @@ st.markdown("""
 
 # ===== HELPER FUNCTIONS =====
 
+@st.cache_resource(show_spinner=False)
+def get_session():
+    """Pooled keep-alive HTTP session shared by all API calls, reruns and user sessions"""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=1))
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+SESSION = get_session()
+
 def test_api_connection():
     """Test if Flask API server is running and accessible"""
     try:
-        response = requests.get(f"{API_ROOT}/ping", timeout=3)
+        response = SESSION.get(f"{API_ROOT}/ping", timeout=3)
         if response.status_code == 200 and response.json().get('status') == 'pong':
             return True, "Connected"
     except requests.exceptions.ConnectionError:
@@ -82,7 +140,7 @@ def test_api_connection():
 def test_database_connection():
     """Test if database is connected and has data"""
     try:
-        response = requests.get(f"{API_ROOT}/test-db", timeout=5)
+        response = SESSION.get(f"{API_ROOT}/test-db", timeout=5)
         if response.status_code == 200:
             data = response.json()
             if data.get('status') == 'success':
@@ -91,8 +149,82 @@ def test_database_connection():
     except Exception as e:
         return False, {"error": str(e)}
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
 def fetch_api(endpoint, params=None):
+    """
+    Fetch data from API, short-circuiting when the API is known to be down
+    
+    The sidebar connection check stores its result in st.session_state['api_up'];
+    when it is False no socket is opened and None is returned immediately.
+    
+    Args:
+        endpoint: API endpoint path (without /api/ prefix)
+        params: Query parameters
+    
+    Returns:
+        JSON response or None on error
+    """
+    if not st.session_state.get('api_up', True):
+        return None
+    try:
+        return _fetch_api_cached(endpoint, params)
+    except Exception as e:
+        _show_api_error(endpoint, e)
+        return None
+
+def cached_fetch(path, params=None):
+    """
+    Like fetch_api, but memoized for 10 minutes
+    
+    Used for user-driven lookups (country, WHO regions, FHIR observation) so that
+    repeating a query moments later is a cache hit instead of a network round-trip.
+    Failures are not cached, so a retry after the API comes back goes to the network.
+    """
+    if not st.session_state.get('api_up', True):
+        return None
+    try:
+        return _cached_fetch(path, params)
+    except Exception as e:
+        _show_api_error(path, e)
+        return None
+
+# The cached fetchers raise on failure (st.cache_data does not store exceptions,
+# so failures are never cached) and draw nothing, so they are safe on the worker pool
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def _fetch_api_cached(endpoint, params=None):
+    return _get_json(endpoint, params)
+
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def _cached_fetch(path, params=None):
+    return _get_json(path, params)
+
+def get_model_performance():
+    """
+    ML model evaluation payload (metrics, ROC curve, confusion matrix, feature importance)
+    
+    Memoized for 5 minutes; failures are rendered here and not cached.
+    """
+    try:
+        return _model_performance_cached()
+    except Exception as e:
+        _show_api_error("predictions/model-performance", e)
+        return None
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def _model_performance_cached():
+    return _get_json("predictions/model-performance")
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_capability_statement():
+    """FHIR CapabilityStatement, shared by all sessions (it only changes on API redeploys)"""
+    return _request_api("fhir/capability")
+
+def _get_json(endpoint, params=None):
+    """GET an API endpoint and decode the JSON body (raises on any failure)"""
+    response = SESSION.get(f"{API_BASE_URL}/{endpoint}", params=params, timeout=15)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+def _request_api(endpoint, params=None):
     """
     Fetch data from API with comprehensive error handling
     
@@ -104,12 +236,22 @@ def fetch_api(endpoint, params=None):
         JSON response or None on error
     """
     try:
-        url = f"{API_BASE_URL}/{endpoint}"
-        response = requests.get(url, params=params, timeout=15)
-        response.raise_for_status()
-        return response.json()
-        
-    except requests.exceptions.ConnectionError:
+        return _get_json(endpoint, params)
+    except Exception as e:
+        _show_api_error(endpoint, e)
+        return None
+
+def _show_api_error(endpoint, error):
+    """
+    Render a failed API request (must be called from the script thread)
+    
+    Args:
+        endpoint: API endpoint path (without /api/ prefix)
+        error: Exception raised by _get_json
+    """
+    url = f"{API_BASE_URL}/{endpoint}"
+    
+    if isinstance(error, requests.exceptions.ConnectionError):
         st.error(f"""
         🔴 **Cannot Connect to Flask API Server**
         
@@ -124,31 +266,285 @@ def fetch_api(endpoint, params=None):
         
         **Quick Fix**: Check sidebar → API Connection Status
         """)
-        return None
         
-    except requests.exceptions.Timeout:
+    elif isinstance(error, requests.exceptions.Timeout):
         st.warning(f"⏱️ API request timeout for endpoint: `{endpoint}`")
         st.info("Server might be processing large data. Try again in a moment.")
-        return None
         
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
+    elif isinstance(error, requests.exceptions.HTTPError):
+        if error.response.status_code == 404:
             st.error(f"❌ Endpoint not found: `{endpoint}`")
-        elif e.response.status_code == 500:
+        elif error.response.status_code == 500:
             st.error(f"❌ Server error. Check Flask terminal for details.")
             with st.expander("View Error Details"):
-                st.json(e.response.json())
+                st.json(error.response.json())
         else:
-            st.error(f"❌ HTTP {e.response.status_code}: {e.response.reason}")
-        return None
+            st.error(f"❌ HTTP {error.response.status_code}: {error.response.reason}")
         
-    except requests.exceptions.JSONDecodeError:
+    elif isinstance(error, (requests.exceptions.JSONDecodeError, orjson.JSONDecodeError)):
         st.error("❌ Invalid JSON response from API")
-        return None
         
-    except Exception as e:
-        st.error(f"❌ Unexpected error: {type(e).__name__}: {str(e)}")
-        return None
+    else:
+        st.error(f"❌ Unexpected error: {type(error).__name__}: {str(error)}")
+
+@st.cache_resource
+def get_executor():
+    """Shared thread pool for issuing independent API requests concurrently"""
+    return ThreadPoolExecutor(max_workers=4)
+
+_EXEC = get_executor()
+
+def submit_api(endpoint, params=None):
+    """
+    Run a cached API fetch on the shared thread pool
+    
+    The worker thread is attached to the current script run so that
+    st.cache_data keeps working, but it never draws anything: failures are
+    returned as data and rendered by api_result() on the script thread.
+    
+    Returns:
+        concurrent.futures.Future to pass to api_result()
+    """
+    ctx = get_script_run_ctx()
+    api_up = st.session_state.get('api_up', True)
+    
+    def _run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        if not api_up:
+            return endpoint, None, None
+        try:
+            return endpoint, _fetch_api_cached(endpoint, params), None
+        except Exception as e:
+            return endpoint, None, e
+    
+    return _EXEC.submit(_run)
+
+def api_result(future):
+    """
+    Wait for a submit_api() future and render its error, if any
+    
+    Returns:
+        JSON response or None on error (same contract as fetch_api)
+    """
+    endpoint, data, error = future.result()
+    if error is not None:
+        _show_api_error(endpoint, error)
+    return data
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _format_kpis(_metrics, date):
+    """
+    Format the dashboard KPI values once per metrics snapshot
+    
+    Args:
+        _metrics: 'metrics' dict from /api/dashboard/metrics (not hashed)
+        date: Snapshot date, used to key the cache
+    
+    Returns:
+        dict of display strings (deltas are None when there is no change)
+    """
+    conf = _metrics['confirmed']
+    deaths_d = _metrics['deaths']
+    rates = _metrics['rates']
+    new_cases = conf.get('new_cases', 0)
+    new_deaths = deaths_d.get('new_deaths', 0)
+    
+    return {
+        'confirmed_total': f"{conf['total']:,}",
+        'confirmed_delta': f"+{new_cases:,}" if new_cases else None,
+        'deaths_total': f"{deaths_d['total']:,}",
+        'deaths_delta': f"+{new_deaths:,}" if new_deaths else None,
+        'recovered_total': f"{_metrics['recovered']['total']:,}",
+        'active_total': f"{_metrics['active']['total']:,}",
+        'mortality_rate': f"{rates['mortality_rate']:.2f}%",
+        'recovery_rate': f"{rates['recovery_rate']:.2f}%"
+    }
+
+@st.cache_resource
+def get_dark_template():
+    """Resolve the plotly_dark template once per process instead of by name on every figure"""
+    import plotly.io as pio
+    return pio.templates["plotly_dark"]
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=32)
+def to_csv_bytes(_df, country, n_rows, latest_date):
+    """
+    Serialize a country DataFrame to CSV bytes once per dataset
+    
+    The DataFrame itself is not hashed (leading underscore); the cache is keyed on
+    (country, n_rows, latest_date), which identifies a country history snapshot.
+    """
+    buf = io.BytesIO()
+    _df.to_csv(buf, index=False, encoding='utf-8', chunksize=10_000, lineterminator='\n')
+    return buf.getvalue()
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=16)
+def build_country_view(country, n_rows, latest_date, _cols):
+    """
+    DataFrame and charts for one country history snapshot
+    
+    The columnar payload is not hashed (leading underscore); as with to_csv_bytes
+    the cache is keyed on (country, n_rows, latest_date). Figures are returned as
+    plain dicts of their downsampled view, which st.plotly_chart accepts directly.
+    
+    Returns:
+        (df, trend figure dict, daily new cases figure dict)
+    """
+    import numpy as np
+    import plotly.graph_objects as go
+    from _timeseries import new_timeseries_figure, add_timeseries_trace
+    
+    dark = get_dark_template()
+    numeric_cols = list(COUNTRY_SCHEMA)
+    
+    # Columnar payload goes straight into typed arrays (no row-of-dicts transpose);
+    # the API sends counts as ints, so each column is built with its final dtype
+    df = pd.DataFrame({
+        'date': pd.to_datetime(_cols['date'], format='%Y-%m-%d', cache=True),
+        'country': _cols['country'],
+        **{c: np.asarray(_cols[c], dtype=dtype) for c, dtype in COUNTRY_SCHEMA.items()}
+    })
+    
+    # Time series chart
+    color_map = {
+        'confirmed': 'orange',
+        'deaths': 'red',
+        'recovered': 'green',
+        'active': 'blue'
+    }
+    
+    fig = new_timeseries_figure()
+    for c in numeric_cols:
+        add_timeseries_trace(
+            fig,
+            go.Scattergl(name=c, mode='lines', line_color=color_map[c]),
+            df['date'],
+            df[c]
+        )
+    
+    fig.update_layout(
+        title=f'<b>COVID-19 Time Series: {country}</b>',
+        xaxis_title='Date',
+        yaxis_title='Number of Cases',
+        legend_title_text='Category',
+        template=dark,
+        height=500,
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    
+    # Day-over-day differences of confirmed/deaths in one NumPy pass
+    arr = df[['confirmed', 'deaths']].to_numpy(dtype=np.int64)
+    daily = np.empty_like(arr)
+    daily[0] = 0
+    np.subtract(arr[1:], arr[:-1], out=daily[1:])
+    
+    fig2 = new_timeseries_figure()
+    
+    add_timeseries_trace(
+        fig2,
+        go.Bar(name='Daily Confirmed', marker_color='orange'),
+        df['date'],
+        daily[:, 0]
+    )
+    
+    # Deaths as a thin line on a secondary axis instead of a second full bar trace
+    add_timeseries_trace(
+        fig2,
+        go.Scatter(name='Daily Deaths', mode='lines', line=dict(color='red', width=1), yaxis='y2'),
+        df['date'],
+        daily[:, 1]
+    )
+    
+    fig2.update_layout(
+        template=dark,
+        height=400,
+        title=f"<b>Daily New Cases: {country}</b>",
+        xaxis_title="Date",
+        yaxis_title="Daily New Cases",
+        yaxis2=dict(title="Daily Deaths", overlaying='y', side='right', showgrid=False),
+        hovermode='x unified'
+    )
+    
+    return df, fig.to_dict(), fig2.to_dict()
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=64)
+def _pretty_json(key, _obj):
+    """
+    Indented, key-sorted JSON text for _obj
+    
+    The payload itself is not hashed (leading underscore); the cache is keyed on
+    key, a cheap identifier of the response such as (endpoint, country, date).
+    """
+    return orjson.dumps(_obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+
+def _decimate(x, y, n=200):
+    """
+    Keep at most n evenly spaced points of a curve (first and last point included)
+    
+    Used for ROC curves, whose length follows the test-set size.
+    """
+    import numpy as np
+    idx = np.linspace(0, len(x) - 1, min(n, len(x))).astype(int)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def build_report(payload_tuple, pred_tuple):
+    """
+    Body of the downloadable prediction report (everything below the date header)
+    
+    Args:
+        payload_tuple: (confirmed, deaths, recovered, active, who_region)
+        pred_tuple: (risk_level, risk_score, confidence, mortality_rate,
+                     recommendation, training_accuracy, features_count)
+    """
+    confirmed, deaths, recovered, active, who_region = payload_tuple
+    (risk_level, risk_score, confidence, mortality_rate,
+     recommendation, training_accuracy, features_count) = pred_tuple
+    
+    return """INPUT DATA:
+-----------
+Confirmed Cases: {confirmed:,}
+Deaths: {deaths:,}
+Recovered: {recovered:,}
+Active: {active:,}
+WHO Region: {who_region}
+
+PREDICTION RESULTS:
+-------------------
+Risk Level: {risk_level}
+Risk Score: {risk_score:.3f} ({risk_pct:.1f}%)
+Model Confidence: {confidence:.3f} ({confidence_pct:.1f}%)
+Current Mortality Rate: {mortality_rate:.2f}%
+
+RECOMMENDATION:
+---------------
+{recommendation}
+
+MODEL INFORMATION:
+------------------
+Algorithm: Random Forest Classifier
+Training Accuracy: {training_accuracy:.3f}
+Features Used: {features_count}
+
+Generated by: COVID-19 Health Informatics Dashboard
+ITENAS Health Informatics - IFB-499 Informatika Terapan
+""".format(
+        confirmed=confirmed, deaths=deaths, recovered=recovered, active=active, who_region=who_region,
+        risk_level=risk_level, risk_score=risk_score, risk_pct=risk_score * 100,
+        confidence=confidence, confidence_pct=confidence * 100, mortality_rate=mortality_rate,
+        recommendation=recommendation, training_accuracy=training_accuracy, features_count=features_count
+    )
+
+def _fast_json_block(key, obj):
+    """Pretty-print a JSON-compatible object as a code block (orjson, no JSON tree widget)"""
+    st.code(_pretty_json(key, obj), language="json")
 
 # ===== HEADER =====
 st.markdown('<div class="main-header">🦠 COVID-19 Integrated Public Health Dashboard</div>', unsafe_allow_html=True)
@@ -166,6 +562,7 @@ st.sidebar.subheader("🔌 System Status")
 with st.sidebar:
     # Test API connection
     api_connected, api_message = test_api_connection()
+    st.session_state['api_up'] = api_connected
     
     if api_connected:
         st.success(f"✅ Flask API: {api_message}")
@@ -222,6 +619,7 @@ st.sidebar.info("""
 - `/api/cases/country/{name}`
 - `/api/cases/who-regions`
 - `/api/predictions/mortality`
+- `/api/predictions/mortality/batch`
 - `/api/predictions/model-performance`
 - `/api/fhir/observation`
 - `/api/fhir/capability`
@@ -231,6 +629,16 @@ st.sidebar.info("""
 # PAGE 1: REAL-TIME MONITORING
 # ==============================
 if page == "🌍 Real-time Monitoring":
+    # Plotting libraries are imported per page so that pages without charts
+    # (FHIR, About, Security) never pay their import cost
+    import plotly.graph_objects as go
+    import plotly.express as px
+    from plotly.subplots import make_subplots
+    import numpy as np
+    from _fastagg import rolling_mean
+    
+    _DARK = get_dark_template()
+    
     st.header("🌍 Real-time COVID-19 Global Outbreak Monitoring")
     st.markdown("**Modul 5**: Public Health Informatics | **Modul 7**: Data Analytics & Business Intelligence")
     
@@ -239,9 +647,15 @@ if page == "🌍 Real-time Monitoring":
         st.warning("⚠️ Cannot load dashboard. Flask API is not running. Check sidebar for instructions.")
         st.stop()
     
-    # Fetch dashboard metrics from API
-    with st.spinner("📊 Loading dashboard metrics..."):
-        metrics_data = fetch_api("dashboard/metrics")
+    # Fetch metrics, time series and top countries concurrently; the country
+    # limit comes from the slider's session state (set before this rerun)
+    limit = st.session_state.get("top_countries_limit", 20)
+    metrics_future = submit_api("dashboard/metrics")
+    timeseries_future = submit_api("dashboard/timeseries")
+    countries_future = submit_api("dashboard/countries/top", params={"limit": limit})
+    
+    with st.spinner("📊 Loading dashboard data..."):
+        metrics_data = api_result(metrics_future)
     
     if metrics_data and metrics_data.get('status') == 'success':
         data = metrics_data['data']
@@ -250,37 +664,37 @@ if page == "🌍 Real-time Monitoring":
         # Display date
         st.subheader(f"📅 Latest Update: {data['date']}")
         
+        kpis = _format_kpis(metrics, data['date'])
+        
         # KPI Metrics Row 1
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            new_cases = metrics['confirmed'].get('new_cases', 0)
             st.metric(
                 label="🔴 Total Confirmed",
-                value=f"{metrics['confirmed']['total']:,}",
-                delta=f"+{new_cases:,}" if new_cases else None,
+                value=kpis['confirmed_total'],
+                delta=kpis['confirmed_delta'],
                 delta_color="inverse"
             )
         
         with col2:
-            new_deaths = metrics['deaths'].get('new_deaths', 0)
             st.metric(
                 label="💀 Total Deaths",
-                value=f"{metrics['deaths']['total']:,}",
-                delta=f"+{new_deaths:,}" if new_deaths else None,
+                value=kpis['deaths_total'],
+                delta=kpis['deaths_delta'],
                 delta_color="inverse"
             )
         
         with col3:
             st.metric(
                 label="💚 Total Recovered",
-                value=f"{metrics['recovered']['total']:,}"
+                value=kpis['recovered_total']
             )
         
         with col4:
             st.metric(
                 label="⚠️ Active Cases",
-                value=f"{metrics['active']['total']:,}"
+                value=kpis['active_total']
             )
         
         # KPI Metrics Row 2
@@ -289,13 +703,13 @@ if page == "🌍 Real-time Monitoring":
         with col5:
             st.metric(
                 label="📊 Global Mortality Rate",
-                value=f"{metrics['rates']['mortality_rate']:.2f}%"
+                value=kpis['mortality_rate']
             )
         
         with col6:
             st.metric(
                 label="📈 Global Recovery Rate",
-                value=f"{metrics['rates']['recovery_rate']:.2f}%"
+                value=kpis['recovery_rate']
             )
         
         st.markdown("---")
@@ -303,12 +717,11 @@ if page == "🌍 Real-time Monitoring":
         # Time Series Chart
         st.subheader("📈 Global COVID-19 Trend Analysis")
         
-        with st.spinner("📊 Loading time series data..."):
-            timeseries_data = fetch_api("dashboard/timeseries")
+        timeseries_data = api_result(timeseries_future)
         
         if timeseries_data and timeseries_data.get('status') == 'success':
             df = pd.DataFrame(timeseries_data['data'])
-            df['date'] = pd.to_datetime(df['date'])
+            df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', cache=True)
             
             # Create 4-panel chart
             fig = make_subplots(
@@ -330,6 +743,16 @@ if page == "🌍 Real-time Monitoring":
                 row=1, col=1
             )
             
+            fig.add_trace(
+                go.Scatter(
+                    x=df['date'],
+                    y=rolling_mean(df['confirmed'].to_numpy(np.float64), 7),
+                    name="Confirmed (7-day avg)",
+                    line=dict(color='white', width=1, dash='dot')
+                ),
+                row=1, col=1
+            )
+            
             fig.add_trace(
                 go.Scatter(
                     x=df['date'], 
@@ -366,13 +789,12 @@ if page == "🌍 Real-time Monitoring":
                 row=2, col=2
             )
             
-            fig.update_xaxes(title_text="Date")
-            fig.update_yaxes(title_text="Cases")
-            
             fig.update_layout(
+                xaxis_title="Date", xaxis2_title="Date", xaxis3_title="Date", xaxis4_title="Date",
+                yaxis_title="Cases", yaxis2_title="Cases", yaxis3_title="Cases", yaxis4_title="Cases",
                 showlegend=False,
                 height=700,
-                template="plotly_dark",
+                template=_DARK,
                 title_text="<b>COVID-19 Global Time Series Analysis</b>",
                 title_font_size=18
             )
@@ -402,14 +824,14 @@ if page == "🌍 Real-time Monitoring":
         
         # Country limit selector
         limit_options = [10, 20, 30, 50]
-        limit = st.select_slider("Number of countries to display", options=limit_options, value=20)
+        limit = st.select_slider("Number of countries to display", options=limit_options, value=20, key="top_countries_limit")
         
-        with st.spinner(f"📊 Loading top {limit} countries..."):
-            countries_data = fetch_api("dashboard/countries/top", params={"limit": limit})
+        countries_data = api_result(countries_future)
         
         if countries_data and countries_data.get('status') == 'success':
             df_countries = pd.DataFrame(countries_data['data'])
-            df_countries_sorted = df_countries.sort_values('confirmed', ascending=True)
+            # API returns countries by confirmed DESC; reverse so the largest bar is on top
+            df_countries_sorted = df_countries.iloc[::-1].reset_index(drop=True)
             
             fig2 = px.bar(
                 df_countries_sorted,
@@ -431,7 +853,7 @@ if page == "🌍 Real-time Monitoring":
             
             fig2.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
             fig2.update_layout(
-                template="plotly_dark",
+                template=_DARK,
                 title=f"<b>Top {limit} Countries by Confirmed Cases (Color: Mortality Rate)</b>",
                 xaxis_title="Confirmed Cases",
                 yaxis_title="Country"
@@ -444,7 +866,7 @@ if page == "🌍 Real-time Monitoring":
                 df_display = df_countries[['country', 'confirmed', 'deaths', 'recovered', 'active', 'mortality_rate']].copy()
                 df_display.columns = ['Country', 'Confirmed', 'Deaths', 'Recovered', 'Active', 'Mortality Rate (%)']
                 st.dataframe(
-                    df_display.sort_values('Confirmed', ascending=False),
+                    df_display,
                     use_container_width=True,
                     hide_index=True
                 )
@@ -455,6 +877,8 @@ if page == "🌍 Real-time Monitoring":
 # PAGE 2: COUNTRY ANALYSIS
 # ==============================
 elif page == "📈 Country Analysis":
+    import numpy as np
+    
     st.header("📈 Country-Specific COVID-19 Analysis")
     st.markdown("**Modul 5**: Public Health Informatics - Epidemiological Analysis by Country")
     
@@ -484,139 +908,75 @@ elif page == "📈 Country Analysis":
         if quick_select:
             country = quick_select
     
-    if st.button("🔍 Analyze Country", type="primary"):
+    @st.fragment
+    def render_country(country):
+        """Load and chart one country; widgets inside rerun only this fragment"""
         with st.spinner(f"📊 Loading data for {country}..."):
-            country_data = fetch_api(f"cases/country/{country}")
+            country_data = cached_fetch(f"cases/country/{country}", params={"orient": "columns"})
         
         if country_data and country_data.get('status') == 'success':
-            df = pd.DataFrame(country_data['data'])
-            df['date'] = pd.to_datetime(df['date'])
-            
-            # ===== FIX: Convert to numeric =====
-            numeric_cols = ['confirmed', 'deaths', 'recovered', 'active']
-            for col in numeric_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            
-            # Latest metrics
-            latest = df.iloc[-1]
-            previous = df.iloc[-2] if len(df) > 1 else latest
+            # Frame and figures are cached per history snapshot, so reruns that
+            # keep showing this country neither rebuild nor re-downsample them
+            cols = country_data['data']
+            latest_date = cols['date'][-1]
+            df, fig, fig2 = build_country_view(country, len(cols['date']), latest_date, cols)
+            numeric_cols = list(COUNTRY_SCHEMA)
+            
+            # Latest metrics: one 2x4 int slice instead of two object-dtype row Series
+            # (column order: confirmed, deaths, recovered, active)
+            vals = df[numeric_cols].to_numpy(dtype=np.int64, copy=False)
+            last_row = vals[-1]
+            prev_row = vals[-2] if len(vals) > 1 else last_row
+            deltas = last_row - prev_row
             
             st.success(f"✅ Data loaded for **{country}** ({len(df)} days)")
             
-            # KPI Metrics
-            col1, col2, col3, col4 = st.columns(4)
+            # KPI Metrics: (label, value, delta, delta_color) built straight from the NumPy rows
+            fmt = lambda n: f"{int(n):,}"
+            cards = [
+                ("Confirmed", fmt(last_row[0]), f"+{fmt(deltas[0])}" if deltas[0] > 0 else None, "normal"),
+                ("Deaths", fmt(last_row[1]), f"+{fmt(deltas[1])}" if deltas[1] > 0 else None, "inverse"),
+                ("Recovered", fmt(last_row[2]), None, "normal"),
+                ("Active", fmt(last_row[3]), None, "normal")
+            ]
             
-            with col1:
-                delta_confirmed = int(latest['confirmed'] - previous['confirmed'])
-                st.metric(
-                    "Confirmed", 
-                    f"{int(latest['confirmed']):,}",
-                    delta=f"+{delta_confirmed:,}" if delta_confirmed > 0 else None
-                )
-            
-            with col2:
-                delta_deaths = int(latest['deaths'] - previous['deaths'])
-                st.metric(
-                    "Deaths", 
-                    f"{int(latest['deaths']):,}",
-                    delta=f"+{delta_deaths:,}" if delta_deaths > 0 else None,
-                    delta_color="inverse"
-                )
-            
-            with col3:
-                st.metric("Recovered", f"{int(latest['recovered']):,}")
-            
-            with col4:
-                st.metric("Active", f"{int(latest['active']):,}")
+            for col, (label, val, delta, color) in zip(st.columns(4), cards):
+                col.metric(label, val, delta=delta, delta_color=color)
             
             # Calculated metrics
-            mortality_rate = (latest['deaths'] / latest['confirmed'] * 100) if latest['confirmed'] > 0 else 0
-            recovery_rate = (latest['recovered'] / latest['confirmed'] * 100) if latest['confirmed'] > 0 else 0
+            conf = last_row[0]
+            mortality = (last_row[1] / conf * 100) if conf else 0.0
+            recovery = (last_row[2] / conf * 100) if conf else 0.0
+            mortality_str = f"{mortality:.2f}%"
+            recovery_str = f"{recovery:.2f}%"
             
             col5, col6, col7 = st.columns(3)
             
             with col5:
-                st.metric("Mortality Rate", f"{mortality_rate:.2f}%")
+                st.metric("Mortality Rate", mortality_str)
             
             with col6:
-                st.metric("Recovery Rate", f"{recovery_rate:.2f}%")
+                st.metric("Recovery Rate", recovery_str)
             
             with col7:
-                st.metric("Latest Date", latest['date'].strftime('%Y-%m-%d'))
+                st.metric("Latest Date", latest_date)
             
             st.markdown("---")
             
             # Time series chart
             st.subheader(f"📈 COVID-19 Trend in {country}")
             
-            fig = px.line(
-                df,
-                x='date',
-                y=['confirmed', 'deaths', 'recovered', 'active'],
-                title=f'<b>COVID-19 Time Series: {country}</b>',
-                labels={'value': 'Number of Cases', 'variable': 'Category', 'date': 'Date'},
-                color_discrete_map={
-                    'confirmed': 'orange',
-                    'deaths': 'red',
-                    'recovered': 'green',
-                    'active': 'blue'
-                }
-            )
-            
-            fig.update_layout(
-                template="plotly_dark", 
-                height=500,
-                hovermode='x unified',
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                )
-            )
-            
             st.plotly_chart(fig, use_container_width=True)
             
             # Daily new cases chart
             st.subheader("📊 Daily New Cases")
             
-            df['daily_confirmed'] = df['confirmed'].diff().fillna(0)
-            df['daily_deaths'] = df['deaths'].diff().fillna(0)
-            
-            fig2 = go.Figure()
-            
-            fig2.add_trace(go.Bar(
-                x=df['date'],
-                y=df['daily_confirmed'],
-                name='Daily Confirmed',
-                marker_color='orange'
-            ))
-            
-            fig2.add_trace(go.Bar(
-                x=df['date'],
-                y=df['daily_deaths'],
-                name='Daily Deaths',
-                marker_color='red'
-            ))
-            
-            fig2.update_layout(
-                template="plotly_dark",
-                height=400,
-                title=f"<b>Daily New Cases: {country}</b>",
-                xaxis_title="Date",
-                yaxis_title="Daily New Cases",
-                barmode='overlay',
-                hovermode='x unified'
-            )
-            
             st.plotly_chart(fig2, use_container_width=True)
             
             # Download data option
-            csv = df.to_csv(index=False)
             st.download_button(
                 label="📥 Download Data as CSV",
-                data=csv,
+                data=to_csv_bytes(df, country, len(df), latest_date),
                 file_name=f"covid19_{country.replace(' ', '_')}.csv",
                 mime="text/csv"
             )
@@ -624,11 +984,24 @@ elif page == "📈 Country Analysis":
         else:
             st.error(f"❌ No data found for country: **{country}**")
             st.info("💡 **Tips**: \n- Check spelling (case-sensitive)\n- Try using full country name\n- Use Quick Select dropdown for popular countries")
+    
+    if st.button("🔍 Analyze Country", type="primary"):
+        st.session_state['selected_country'] = country
+    
+    # Keep the last analyzed country on screen across reruns from other widgets;
+    # those reruns hit the fetch and build_country_view caches
+    if st.session_state.get('selected_country'):
+        render_country(st.session_state['selected_country'])
 
 # ==============================
 # PAGE 3: WHO REGIONS
 # ==============================
 elif page == "🗺️ WHO Regions":
+    import plotly.express as px
+    import numpy as np
+    
+    _DARK = get_dark_template()
+    
     st.header("🗺️ COVID-19 Cases by WHO Region")
     st.markdown("**Modul 5**: Public Health Informatics - Regional Epidemiological Surveillance")
     
@@ -637,7 +1010,7 @@ elif page == "🗺️ WHO Regions":
         st.stop()
     
     with st.spinner("📊 Loading WHO region data..."):
-        regions_data = fetch_api("cases/who-regions")
+        regions_data = cached_fetch("cases/who-regions")
     
     if regions_data and regions_data.get('status') == 'success':
         df_regions = pd.DataFrame(regions_data['data'])
@@ -668,44 +1041,43 @@ elif page == "🗺️ WHO Regions":
         # Grouped bar chart
         st.subheader("📊 Cases by WHO Region")
         
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=df_regions['region'],
-            y=df_regions['confirmed'],
-            name='Confirmed',
-            marker_color='orange',
-            text=df_regions['confirmed'],
-            texttemplate='%{text:,.0f}',
-            textposition='outside'
-        ))
-        
-        fig.add_trace(go.Bar(
-            x=df_regions['region'],
-            y=df_regions['deaths'],
-            name='Deaths',
-            marker_color='red',
-            text=df_regions['deaths'],
-            texttemplate='%{text:,.0f}',
-            textposition='outside'
-        ))
-        
-        fig.add_trace(go.Bar(
-            x=df_regions['region'],
-            y=df_regions['recovered'],
-            name='Recovered',
-            marker_color='green',
-            text=df_regions['recovered'],
-            texttemplate='%{text:,.0f}',
-            textposition='outside'
-        ))
+        # One row per (region, metric); px.bar still emits one trace per metric.
+        # Columns are renamed first so legend entries keep their display names
+        long_df = df_regions.rename(columns={
+            'confirmed': 'Confirmed',
+            'deaths': 'Deaths',
+            'recovered': 'Recovered'
+        }).melt(
+            id_vars='region',
+            value_vars=['Confirmed', 'Deaths', 'Recovered'],
+            var_name='metric',
+            value_name='cases'
+        )
+        # Bar labels formatted once here instead of by d3-format on every redraw
+        long_df['cases_txt'] = [f"{int(v):,}" for v in long_df['cases']]
+        
+        fig = px.bar(
+            long_df,
+            x='region',
+            y='cases',
+            color='metric',
+            barmode='group',
+            text='cases_txt',
+            color_discrete_map={
+                'Confirmed': 'orange',
+                'Deaths': 'red',
+                'Recovered': 'green'
+            },
+            labels={'region': 'WHO Region', 'cases': 'Number of Cases', 'metric': ''}
+        )
         
+        fig.update_traces(textposition='outside')
         fig.update_layout(
             title='<b>COVID-19 Cases by WHO Region</b>',
             xaxis_title='WHO Region',
             yaxis_title='Number of Cases',
-            barmode='group',
-            template="plotly_dark",
+            legend_title_text='',
+            template=_DARK,
             height=600,
             hovermode='x unified'
         )
@@ -725,28 +1097,47 @@ elif page == "🗺️ WHO Regions":
         )
         
         fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-        fig_pie.update_layout(template="plotly_dark", height=500)
+        fig_pie.update_layout(template=_DARK, height=500)
         
         st.plotly_chart(fig_pie, use_container_width=True)
         
         # Data table
         st.subheader("📋 Detailed Regional Statistics")
         
-        # Add calculated columns
-        df_display = df_regions.copy()
-        df_display['mortality_rate'] = (df_display['deaths'] / df_display['confirmed'] * 100).round(2)
-        df_display['recovery_rate'] = (df_display['recovered'] / df_display['confirmed'] * 100).round(2)
-        
-        # Replace inf/nan
-        df_display['mortality_rate'] = df_display['mortality_rate'].replace([np.inf, -np.inf], 0).fillna(0)
-        df_display['recovery_rate'] = df_display['recovery_rate'].replace([np.inf, -np.inf], 0).fillna(0)
-        
-        # Reorder columns
-        df_display = df_display[['region', 'confirmed', 'deaths', 'recovered', 'active', 'mortality_rate', 'recovery_rate']]
-        df_display.columns = ['WHO Region', 'Confirmed', 'Deaths', 'Recovered', 'Active', 'Mortality Rate (%)', 'Recovery Rate (%)']
-        
+        # Column arrays, shared by the rate math and the display table
+        conf_arr = df_regions['confirmed'].to_numpy()
+        deaths_arr = df_regions['deaths'].to_numpy()
+        rec_arr = df_regions['recovered'].to_numpy()
+        active_arr = df_regions['active'].to_numpy()
+        
+        # Calculated rates (0 where there are no confirmed cases)
+        conf = conf_arr.astype(np.float64)
+        mask = conf > 0
+        
+        mort = np.zeros_like(conf)
+        np.divide(deaths_arr, conf, out=mort, where=mask)
+        mort *= 100
+        np.round(mort, 2, out=mort)
+        
+        rec_rate = np.zeros_like(conf)
+        np.divide(rec_arr, conf, out=rec_rate, where=mask)
+        rec_rate *= 100
+        np.round(rec_rate, 2, out=rec_rate)
+        
+        df_display = pd.DataFrame({
+            'WHO Region': df_regions['region'].to_numpy(),
+            'Confirmed': conf_arr,
+            'Deaths': deaths_arr,
+            'Recovered': rec_arr,
+            'Active': active_arr,
+            'Mortality Rate (%)': mort,
+            'Recovery Rate (%)': rec_rate
+        })
+        
+        # Positional take by descending confirmed (no label alignment / sort plumbing)
+        order = np.argsort(-conf, kind='stable')
         st.dataframe(
-            df_display.sort_values('Confirmed', ascending=False),
+            df_display.take(order),
             use_container_width=True,
             hide_index=True
         )
@@ -797,11 +1188,15 @@ elif page == "🔬 FHIR API Demo":
         )
     
     if st.button("🔍 Fetch FHIR Observation", type="primary"):
+        fhir_params = {
+            "country": fhir_country,
+            "date": fhir_date.strftime('%Y-%m-%d')
+        }
+        # Identifies this response for the pretty-printed JSON cache
+        fhir_key = ("fhir/observation", fhir_params["country"], fhir_params["date"])
+        
         with st.spinner("📡 Fetching FHIR resource from API..."):
-            fhir_data = fetch_api("fhir/observation", params={
-                "country": fhir_country,
-                "date": fhir_date.strftime('%Y-%m-%d')
-            })
+            fhir_data = cached_fetch("fhir/observation", params=fhir_params)
         
         if fhir_data:
             if fhir_data.get('resourceType') == 'Observation':
@@ -810,6 +1205,12 @@ elif page == "🔬 FHIR API Demo":
                 # Display key information
                 st.subheader("📋 FHIR Observation Details")
                 
+                subject = fhir_data['subject']
+                value_quantity = fhir_data['valueQuantity']
+                
+                # Walk the components once: {code text: value}
+                comp_map = {c['code'].get('text', 'Unknown'): c['valueQuantity']['value'] for c in fhir_data.get('component', [])}
+                
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
@@ -817,20 +1218,16 @@ elif page == "🔬 FHIR API Demo":
                     st.metric("Status", fhir_data['status'].upper())
                 
                 with col2:
-                    st.metric("Subject (Location)", fhir_data['subject']['display'])
+                    st.metric("Subject (Location)", subject['display'])
                     st.metric("Effective Date", fhir_data['effectiveDateTime'])
                 
                 with col3:
                     # ===== FIX: Convert to int before formatting =====
-                    confirmed_value = int(fhir_data['valueQuantity']['value'])
+                    confirmed_value = int(value_quantity['value'])
                     st.metric("Confirmed Cases", f"{confirmed_value:,}")
                     
-                    # Extract deaths from components
-                    deaths = next(
-                        (comp['valueQuantity']['value'] for comp in fhir_data.get('component', []) 
-                         if 'Deaths' in comp['code'].get('text', '')),
-                        0
-                    )
+                    # Extract deaths from components (code text as emitted by /api/fhir/observation)
+                    deaths = comp_map.get('COVID-19 Deaths', 0)
                     
                     # Convert deaths to int
                     if isinstance(deaths, (int, float)):
@@ -846,23 +1243,18 @@ elif page == "🔬 FHIR API Demo":
                 if 'component' in fhir_data:
                     st.subheader("🧩 FHIR Observation Components")
                     
-                    for comp in fhir_data['component']:
-                        comp_name = comp['code'].get('text', 'Unknown')
-                        comp_value = comp['valueQuantity']['value']
-                        
-                        # ===== FIX: Convert to int before formatting =====
-                        if isinstance(comp_value, (int, float)):
-                            comp_value_int = int(comp_value)
-                            st.write(f"**{comp_name}**: {comp_value_int:,}")
-                        else:
-                            st.write(f"**{comp_name}**: {comp_value}")
+                    # Render all components as one table (one element instead of one per component)
+                    comp_df = pd.DataFrame(list(comp_map.items()), columns=['Component', 'Value'])
+                    # Decimal sums arrive as strings - coerce so the column is numeric
+                    comp_df['Value'] = pd.to_numeric(comp_df['Value'], errors='coerce')
+                    st.dataframe(comp_df, hide_index=True, use_container_width=True)
 
                 
                 st.markdown("---")
                 
-                # Display full JSON
-                st.subheader("📄 Full FHIR JSON Response")
-                st.json(fhir_data)
+                # Display full JSON (collapsed by default - summary first, raw data on demand)
+                with st.expander("📄 Full FHIR JSON Response", expanded=False):
+                    _fast_json_block(fhir_key, fhir_data)
                 
                 # Postman instructions
                 st.markdown("---")
@@ -896,10 +1288,11 @@ Content-Type: application/fhir+json
                         st.error(f"**{issue.get('severity', 'error').upper()}**: {issue.get('diagnostics', 'Unknown error')}")
                 
                 with st.expander("View Full Response"):
-                    st.json(fhir_data)
+                    _fast_json_block(fhir_key, fhir_data)
             else:
                 st.error("❌ Unexpected response format")
-                st.json(fhir_data)
+                with st.expander("View Full Response", expanded=False):
+                    _fast_json_block(fhir_key, fhir_data)
     
     # FHIR Capability Statement
     st.markdown("---")
@@ -907,7 +1300,7 @@ Content-Type: application/fhir+json
     
     if st.button("📄 View FHIR CapabilityStatement"):
         with st.spinner("📡 Fetching FHIR CapabilityStatement..."):
-            capability_data = fetch_api("fhir/capability")
+            capability_data = get_capability_statement()
         
         if capability_data:
             st.success("✅ FHIR CapabilityStatement Retrieved")
@@ -917,7 +1310,10 @@ Content-Type: application/fhir+json
             st.write(f"**Status**: {capability_data.get('status', 'N/A')}")
             
             with st.expander("View Full CapabilityStatement"):
-                st.json(capability_data)
+                _fast_json_block("fhir/capability", capability_data)
+        else:
+            # Don't keep a failed lookup in the shared cache
+            get_capability_statement.clear()
 
 # ==============================
 # PAGE 4.5: PREDICTIVE ANALYTICS (ML MODEL)
@@ -942,267 +1338,290 @@ elif page == "🤖 Predictive Analytics":
         st.warning("⚠️ Flask API is not running. Cannot load ML model.")
         st.stop()
     
-    # ===== MODEL PERFORMANCE SECTION =====
-    st.subheader("📈 Model Performance Metrics")
+    # Imported only once the page can actually render figures
+    import plotly.graph_objects as go
+    import numpy as np
     
-    with st.spinner("📊 Loading model evaluation metrics..."):
-        perf_data = fetch_api("predictions/model-performance")
+    _DARK = get_dark_template()
     
-    if perf_data and perf_data.get('status') == 'success':
-        metrics = perf_data['metrics']
-        
-        # Display metrics in columns
-        col1, col2, col3, col4, col5 = st.columns(5)
-        
-        with col1:
-            st.metric("Accuracy", f"{metrics['accuracy']:.1%}", 
-                     help="Overall model accuracy on test set")
-        
-        with col2:
-            st.metric("Precision", f"{metrics['precision']:.1%}",
-                     help="Proportion of positive predictions that were correct")
-        
-        with col3:
-            st.metric("Recall", f"{metrics['recall']:.1%}",
-                     help="Proportion of actual positives correctly identified")
-        
-        with col4:
-            st.metric("F1-Score", f"{metrics['f1_score']:.1%}",
-                     help="Harmonic mean of precision and recall")
-        
-        with col5:
-            st.metric("AUC-ROC", f"{metrics['auc_roc']:.3f}",
-                     help="Area under ROC curve (0.5=random, 1.0=perfect)")
-        
-        st.markdown("---")
-        
-        # ===== ROC CURVE =====
-        st.subheader("📊 ROC Curve Analysis")
+    # ===== MODEL PERFORMANCE SECTION =====
+    # Turning metrics off skips the performance fetch and all figures, so
+    # reruns while editing the prediction form stay local
+    show_metrics = st.toggle("Show model metrics", value=True)
+    
+    if show_metrics:
+        st.subheader("📈 Model Performance Metrics")
         
-        st.markdown("""
-        **ROC (Receiver Operating Characteristic) Curve** shows the trade-off between 
-        True Positive Rate and False Positive Rate at various classification thresholds.
-        A higher AUC indicates better model performance.
-        """)
+        if st.button("🔄 Refresh metrics", help="Reload metrics after retraining the model"):
+            _model_performance_cached.clear()
         
-        roc = perf_data['roc_curve']
-        
-        fig_roc = go.Figure()
-        
-        # ROC Curve
-        fig_roc.add_trace(go.Scatter(
-            x=roc['fpr'],
-            y=roc['tpr'],
-            mode='lines',
-            name=f'ROC Curve (AUC = {roc["auc"]:.3f})',
-            line=dict(color='cyan', width=3),
-            fill='tozeroy',
-            fillcolor='rgba(0,255,255,0.1)',
-            hovertemplate='<b>FPR</b>: %{x:.3f}<br><b>TPR</b>: %{y:.3f}<extra></extra>'
-        ))
-        
-        # Random classifier baseline
-        fig_roc.add_trace(go.Scatter(
-            x=[0, 1],
-            y=[0, 1],
-            mode='lines',
-            name='Random Classifier (AUC = 0.500)',
-            line=dict(color='red', width=2, dash='dash')
-        ))
-        
-        # Add annotations
-        fig_roc.add_annotation(
-            x=0.5, y=0.5,
-            text=f"AUC = {roc['auc']:.3f}",
-            showarrow=False,
-            font=dict(size=16, color='cyan'),
-            bgcolor='rgba(0,0,0,0.5)'
-        )
+        # Lay out metrics and the chart area first, with a skeleton box for the chart,
+        # so the page structure shows while the metrics are being fetched
+        metrics_area = st.container()
         
-        fig_roc.update_layout(
-            xaxis_title='False Positive Rate (1 - Specificity)',
-            yaxis_title='True Positive Rate (Sensitivity)',
-            template="plotly_dark",
-            height=500,
-            title="<b>ROC Curve: COVID-19 Mortality Risk Prediction Model</b>",
-            hovermode='closest',
-            showlegend=True,
-            legend=dict(
-                yanchor="bottom",
-                y=0.01,
-                xanchor="right",
-                x=0.99
-            )
-        )
+        # Unlike st.tabs (which runs every tab body), only the selected chart is built
+        chart_views = ("📊 ROC Curve", "🎯 Confusion Matrix", "🔍 Feature Importance")
+        chart_view = st.radio("Chart", chart_views, horizontal=True, label_visibility="collapsed")
         
-        fig_roc.update_xaxes(range=[0, 1], constrain='domain')
-        fig_roc.update_yaxes(range=[0, 1], scaleanchor="x", scaleratio=1)
+        chart_slot = st.empty()
+        chart_slot.markdown(CHART_SKELETON, unsafe_allow_html=True)
         
-        st.plotly_chart(fig_roc, use_container_width=True)
+        with st.spinner("📊 Loading model evaluation metrics..."):
+            perf_data = get_model_performance()
         
-        # Model interpretation
-        with st.expander("📖 How to Interpret ROC Curve"):
-            st.markdown("""
-            **ROC Curve Interpretation:**
+        if perf_data and perf_data.get('status') == 'success':
+            metrics = perf_data['metrics']
             
-            - **Perfect Model (AUC = 1.0)**: Curve follows the left and top edges
-            - **Good Model (AUC > 0.8)**: Curve is well above the diagonal
-            - **Random Model (AUC = 0.5)**: Curve follows the diagonal line
-            - **Poor Model (AUC < 0.5)**: Curve is below the diagonal
+            with metrics_area:
+                # Display metrics in columns
+                col1, col2, col3, col4, col5 = st.columns(5)
             
-            **Our Model Performance:**
-            - AUC = {auc:.3f} indicates **{performance}** discriminative ability
-            - The model can distinguish between high-risk and low-risk cases effectively
-            """.format(
-                auc=roc['auc'],
-                performance="excellent" if roc['auc'] > 0.9 else "good" if roc['auc'] > 0.8 else "fair"
-            ))
-        
-        st.markdown("---")
-        
-        # ===== CONFUSION MATRIX =====
-        st.subheader("🎯 Confusion Matrix")
-        
-        st.markdown("""
-        **Confusion Matrix** shows the model's predictions vs actual outcomes,
-        helping identify types of errors (false positives vs false negatives).
-        """)
-        
-        cm = perf_data['confusion_matrix']
-        
-        # Create confusion matrix visualization
-        cm_matrix = [
-            [cm['true_negative'], cm['false_positive']],
-            [cm['false_negative'], cm['true_positive']]
-        ]
-        
-        # Calculate percentages
-        total = sum([cm['true_negative'], cm['false_positive'], cm['false_negative'], cm['true_positive']])
-        cm_pct = [[val/total*100 for val in row] for row in cm_matrix]
-        
-        # Create heatmap
-        fig_cm = go.Figure(data=go.Heatmap(
-            z=cm_matrix,
-            x=['Predicted: Low Risk', 'Predicted: High Risk'],
-            y=['Actual: Low Risk', 'Actual: High Risk'],
-            text=[[f'{cm_matrix[i][j]}<br>({cm_pct[i][j]:.1f}%)' for j in range(2)] for i in range(2)],
-            texttemplate='%{text}',
-            textfont={"size": 14},
-            colorscale='Blues',
-            showscale=True,
-            hovertemplate='%{x}<br>%{y}<br>Count: %{z}<extra></extra>'
-        ))
-        
-        fig_cm.update_layout(
-            title='<b>Confusion Matrix: Model Predictions vs Actual Outcomes</b>',
-            template="plotly_dark",
-            height=500,
-            xaxis=dict(side='bottom'),
-            yaxis=dict(autorange='reversed')
-        )
-        
-        st.plotly_chart(fig_cm, use_container_width=True)
-        
-        # Confusion matrix metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("True Negatives", f"{cm['true_negative']:,}",
-                     help="Correctly predicted low risk cases")
-        
-        with col2:
-            st.metric("False Positives", f"{cm['false_positive']:,}",
-                     help="Incorrectly predicted as high risk")
-        
-        with col3:
-            st.metric("False Negatives", f"{cm['false_negative']:,}",
-                     help="Incorrectly predicted as low risk")
-        
-        with col4:
-            st.metric("True Positives", f"{cm['true_positive']:,}",
-                     help="Correctly predicted high risk cases")
-        
-        st.markdown("---")
-        
-        # ===== FEATURE IMPORTANCE =====
-        st.subheader("🔍 Feature Importance Analysis")
-        
-        st.markdown("""
-        **Feature Importance** shows which epidemiological factors contribute most
-        to the model's mortality risk predictions.
-        """)
-        
-        feature_imp = perf_data.get('feature_importance', [])[:10]  # Top 10
-        
-        if feature_imp:
-            df_fi = pd.DataFrame(feature_imp)
+                with col1:
+                    st.metric("Accuracy", f"{metrics['accuracy']:.1%}", 
+                             help="Overall model accuracy on test set")
             
-            fig_fi = px.bar(
-                df_fi,
-                x='importance',
-                y='feature',
-                orientation='h',
-                title='<b>Top 10 Most Important Features</b>',
-                text='importance',
-                color='importance',
-                color_continuous_scale='Viridis',
-                height=500
-            )
+                with col2:
+                    st.metric("Precision", f"{metrics['precision']:.1%}",
+                             help="Proportion of positive predictions that were correct")
             
-            fig_fi.update_traces(texttemplate='%{text:.4f}', textposition='outside')
-            fig_fi.update_layout(
-                template="plotly_dark",
-                xaxis_title="Importance Score",
-                yaxis_title="Feature",
-                showlegend=False,
-                yaxis={'categoryorder': 'total ascending'}
-            )
+                with col3:
+                    st.metric("Recall", f"{metrics['recall']:.1%}",
+                             help="Proportion of actual positives correctly identified")
             
-            st.plotly_chart(fig_fi, use_container_width=True)
+                with col4:
+                    st.metric("F1-Score", f"{metrics['f1_score']:.1%}",
+                             help="Harmonic mean of precision and recall")
             
-            with st.expander("📋 Feature Descriptions"):
-                st.markdown("""
-                **Feature Definitions:**
-                
-                - **mortality_rate**: Deaths per 100 confirmed cases
-                - **confirmed/deaths/recovered/active**: Absolute case counts
-                - **recovery_rate**: Recovered per 100 confirmed cases
-                - **confirmed_lag1/deaths_lag1**: Previous day values
-                - **daily_*_change**: Day-over-day changes
-                - ***_rolling_7d**: 7-day moving averages
-                - **growth_rate**: Percentage growth rate
-                - **who_region_encoded**: WHO region classification
-                """)
-        
-        st.markdown("---")
-        
-        # ===== TRAINING INFO =====
-        with st.expander("🎓 Model Training Information"):
-            training_info = perf_data.get('training_info', {})
+                with col5:
+                    st.metric("AUC-ROC", f"{metrics['auc_roc']:.3f}",
+                             help="Area under ROC curve (0.5=random, 1.0=perfect)")
             
-            col1, col2, col3 = st.columns(3)
+                st.markdown("---")
+            
+            # The selected chart replaces the skeleton box
+            with chart_slot.container():
+                if chart_view == chart_views[0]:
+                    # ===== ROC CURVE =====
+                    st.subheader("📊 ROC Curve Analysis")
+                
+                    st.markdown("""
+                    **ROC (Receiver Operating Characteristic) Curve** shows the trade-off between 
+                    True Positive Rate and False Positive Rate at various classification thresholds.
+                    A higher AUC indicates better model performance.
+                    """)
+                
+                    roc = perf_data['roc_curve']
+                
+                    fpr, tpr = _decimate(roc['fpr'], roc['tpr'])
+                
+                    # Whole figure in one constructor call (validated once)
+                    fig_roc = go.Figure(
+                        data=[
+                            # ROC Curve
+                            go.Scatter(
+                                x=fpr,
+                                y=tpr,
+                                mode='lines',
+                                name=f'ROC Curve (AUC = {roc["auc"]:.3f})',
+                                line=dict(color='cyan', width=3),
+                                fill='tozeroy',
+                                fillcolor='rgba(0,255,255,0.1)',
+                                hovertemplate='<b>FPR</b>: %{x:.3f}<br><b>TPR</b>: %{y:.3f}<extra></extra>'
+                            ),
+                            # Random classifier baseline
+                            RANDOM_BASELINE
+                        ],
+                        layout=go.Layout(
+                            **DARK_LAYOUT,
+                            template=_DARK,
+                            title="<b>ROC Curve: COVID-19 Mortality Risk Prediction Model</b>",
+                            xaxis=dict(title='False Positive Rate (1 - Specificity)', range=[0, 1], constrain='domain'),
+                            yaxis=dict(title='True Positive Rate (Sensitivity)', range=[0, 1], scaleanchor="x", scaleratio=1),
+                            showlegend=True,
+                            legend=ROC_LEGEND,
+                            annotations=[dict(
+                                x=0.5, y=0.5,
+                                text=f"AUC = {roc['auc']:.3f}",
+                                showarrow=False,
+                                font=dict(size=16, color='cyan'),
+                                bgcolor='rgba(0,0,0,0.5)'
+                            )]
+                        )
+                    )
+                
+                    st.plotly_chart(fig_roc, use_container_width=True)
+                
+                    # Model interpretation
+                    with st.expander("📖 How to Interpret ROC Curve"):
+                        st.markdown("""
+                        **ROC Curve Interpretation:**
+                    
+                        - **Perfect Model (AUC = 1.0)**: Curve follows the left and top edges
+                        - **Good Model (AUC > 0.8)**: Curve is well above the diagonal
+                        - **Random Model (AUC = 0.5)**: Curve follows the diagonal line
+                        - **Poor Model (AUC < 0.5)**: Curve is below the diagonal
+                    
+                        **Our Model Performance:**
+                        - AUC = {auc:.3f} indicates **{performance}** discriminative ability
+                        - The model can distinguish between high-risk and low-risk cases effectively
+                        """.format(
+                            auc=roc['auc'],
+                            performance="excellent" if roc['auc'] > 0.9 else "good" if roc['auc'] > 0.8 else "fair"
+                        ))
+            
+                elif chart_view == chart_views[1]:
+                    # ===== CONFUSION MATRIX =====
+                    st.subheader("🎯 Confusion Matrix")
+                
+                    st.markdown("""
+                    **Confusion Matrix** shows the model's predictions vs actual outcomes,
+                    helping identify types of errors (false positives vs false negatives).
+                    """)
+                
+                    cm = perf_data['confusion_matrix']
+                
+                    # Create confusion matrix visualization
+                    cm_arr = np.array([
+                        [cm['true_negative'], cm['false_positive']],
+                        [cm['false_negative'], cm['true_positive']]
+                    ], dtype=np.int64)
+                
+                    # Calculate percentages
+                    cm_pct = cm_arr * (100.0 / cm_arr.sum())
+                    cm_text = np.char.add(
+                        np.char.add(cm_arr.astype(str), '<br>('),
+                        np.char.add(np.char.mod('%.1f', cm_pct), '%)')
+                    )
+                
+                    # Create heatmap
+                    fig_cm = go.Figure(
+                        data=go.Heatmap(
+                            z=cm_arr,
+                            x=['Predicted: Low Risk', 'Predicted: High Risk'],
+                            y=['Actual: Low Risk', 'Actual: High Risk'],
+                            text=cm_text,
+                            texttemplate='%{text}',
+                            textfont={"size": 14},
+                            colorscale='Blues',
+                            showscale=True,
+                            hovertemplate='%{x}<br>%{y}<br>Count: %{z}<extra></extra>'
+                        ),
+                        layout=go.Layout(
+                            **DARK_LAYOUT,
+                            template=_DARK,
+                            title='<b>Confusion Matrix: Model Predictions vs Actual Outcomes</b>',
+                            xaxis=dict(side='bottom'),
+                            yaxis=dict(autorange='reversed')
+                        )
+                    )
+                
+                    st.plotly_chart(fig_cm, use_container_width=True)
+                
+                    # Confusion matrix metrics
+                    col1, col2, col3, col4 = st.columns(4)
+                
+                    with col1:
+                        st.metric("True Negatives", f"{cm['true_negative']:,}",
+                                 help="Correctly predicted low risk cases")
+                
+                    with col2:
+                        st.metric("False Positives", f"{cm['false_positive']:,}",
+                                 help="Incorrectly predicted as high risk")
+                
+                    with col3:
+                        st.metric("False Negatives", f"{cm['false_negative']:,}",
+                                 help="Incorrectly predicted as low risk")
+                
+                    with col4:
+                        st.metric("True Positives", f"{cm['true_positive']:,}",
+                                 help="Correctly predicted high risk cases")
             
-            with col1:
-                st.metric("Training Samples", f"{training_info.get('training_samples', 0):,}")
+                else:
+                    # ===== FEATURE IMPORTANCE =====
+                    st.subheader("🔍 Feature Importance Analysis")
+                
+                    st.markdown("""
+                    **Feature Importance** shows which epidemiological factors contribute most
+                    to the model's mortality risk predictions.
+                    """)
+                
+                    feature_imp = perf_data.get('feature_importance', [])[:10]  # Top 10
+                
+                    if feature_imp:
+                        features = [d['feature'] for d in feature_imp]
+                        importances = [d['importance'] for d in feature_imp]
+                    
+                        fig_fi = go.Figure(
+                            go.Bar(
+                                x=importances,
+                                y=features,
+                                orientation='h',
+                                text=[f"{v:.4f}" for v in importances],
+                                textposition='outside',
+                                marker=dict(
+                                    color=importances,
+                                    colorscale='Viridis',
+                                    showscale=True,
+                                    colorbar=dict(title='importance')
+                                )
+                            ),
+                            layout=go.Layout(
+                                **DARK_LAYOUT,
+                                template=_DARK,
+                                title='<b>Top 10 Most Important Features</b>',
+                                xaxis=dict(title="Importance Score"),
+                                yaxis=dict(title="Feature", categoryorder='total ascending'),
+                                showlegend=False
+                            )
+                        )
+                    
+                        st.plotly_chart(fig_fi, use_container_width=True)
+                    
+                        with st.expander("📋 Feature Descriptions"):
+                            st.markdown("""
+                            **Feature Definitions:**
+                        
+                            - **mortality_rate**: Deaths per 100 confirmed cases
+                            - **confirmed/deaths/recovered/active**: Absolute case counts
+                            - **recovery_rate**: Recovered per 100 confirmed cases
+                            - **confirmed_lag1/deaths_lag1**: Previous day values
+                            - **daily_*_change**: Day-over-day changes
+                            - ***_rolling_7d**: 7-day moving averages
+                            - **growth_rate**: Percentage growth rate
+                            - **who_region_encoded**: WHO region classification
+                            """)
             
-            with col2:
-                st.metric("Test Samples", f"{training_info.get('test_samples', 0):,}")
+            st.markdown("---")
             
-            with col3:
-                st.metric("Mortality Threshold", f"{training_info.get('mortality_threshold', 0):.2f}%")
+            # ===== TRAINING INFO =====
+            with st.expander("🎓 Model Training Information"):
+                training_info = perf_data.get('training_info', {})
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("Training Samples", f"{training_info.get('training_samples', 0):,}")
+                
+                with col2:
+                    st.metric("Test Samples", f"{training_info.get('test_samples', 0):,}")
+                
+                with col3:
+                    st.metric("Mortality Threshold", f"{training_info.get('mortality_threshold', 0):.2f}%")
+                
+                st.markdown("""
+                **Model Details:**
+                - **Algorithm**: Random Forest Classifier
+                - **Features**: 15 epidemiological indicators
+                - **Training Method**: Stratified 80/20 train-test split
+                - **Class Balancing**: Balanced class weights
+                - **Cross-validation**: None (single holdout)
+                """)
+        
+        else:
+            chart_slot.empty()
             
-            st.markdown("""
-            **Model Details:**
-            - **Algorithm**: Random Forest Classifier
-            - **Features**: 15 epidemiological indicators
-            - **Training Method**: Stratified 80/20 train-test split
-            - **Class Balancing**: Balanced class weights
-            - **Cross-validation**: None (single holdout)
-            """)
-    
-    else:
-        st.error("❌ Failed to load model metrics. Ensure model has been trained.")
-        st.info("Run: `python train_model.py` in backend directory")
+            st.error("❌ Failed to load model metrics. Ensure model has been trained.")
+            st.info("Run: `python train_model.py` in backend directory")
     
     st.markdown("---")
     
@@ -1266,46 +1685,56 @@ elif page == "🤖 Predictive Analytics":
                 help="Deaths from previous day"
             )
             
-            who_region = st.selectbox(
+            # Selectbox returns the region index, which is the model's encoding
+            who_region_encoded = st.selectbox(
                 "WHO Region",
-                ["Americas", "Europe", "Western Pacific", 
-                 "Eastern Mediterranean", "South-East Asia", "Africa", "Unknown"],
+                range(len(REGIONS)),
+                format_func=REGIONS.__getitem__,
                 index=0,
                 help="WHO regional classification"
             )
-            
-            region_mapping = {
-                'Americas': 0, 'Europe': 1, 'Western Pacific': 2, 
-                'Eastern Mediterranean': 3, 'South-East Asia': 4, 'Africa': 5, 'Unknown': 6
-            }
-            who_region_encoded = region_mapping[who_region]
+            who_region = REGIONS[who_region_encoded]
         
-        # Submit button
-        submitted = st.form_submit_button("🔮 Predict Mortality Risk", type="primary", use_container_width=True)
+        # Submit buttons
+        col_submit, col_add = st.columns([3, 1])
+        
+        with col_submit:
+            submitted = st.form_submit_button("🔮 Predict Mortality Risk", type="primary", use_container_width=True)
+        
+        with col_add:
+            add_scenario = st.form_submit_button(
+                "➕ Add Scenario",
+                use_container_width=True,
+                help="Queue these inputs and predict all queued scenarios in one request"
+            )
+    
+    # Prepare payload
+    payload = {
+        "confirmed": confirmed,
+        "deaths": deaths,
+        "recovered": recovered,
+        "active": active,
+        "confirmed_lag1": confirmed_lag1,
+        "deaths_lag1": deaths_lag1,
+        "who_region_encoded": who_region_encoded
+    }
+    
+    if add_scenario:
+        st.session_state.setdefault('scenarios', []).append(payload)
     
     if submitted:
-        # Prepare payload
-        payload = {
-            "confirmed": confirmed,
-            "deaths": deaths,
-            "recovered": recovered,
-            "active": active,
-            "confirmed_lag1": confirmed_lag1,
-            "deaths_lag1": deaths_lag1,
-            "who_region_encoded": who_region_encoded
-        }
-        
         with st.spinner("🤖 Running ML model prediction..."):
             try:
                 # POST request to prediction API
-                response = requests.post(
+                response = SESSION.post(
                     f"{API_ROOT}/api/predictions/mortality",
-                    json=payload,
+                    data=orjson.dumps(payload),
+                    headers=JSON_HEADERS,
                     timeout=10
                 )
                 
                 if response.status_code == 200:
-                    pred_data = response.json()
+                    pred_data = orjson.loads(response.content)
                     
                     if pred_data.get('status') == 'success':
                         prediction = pred_data['prediction']
@@ -1319,20 +1748,15 @@ elif page == "🤖 Predictive Analytics":
                         risk_color = prediction['risk_color']
                         risk_score = prediction['risk_score']
                         
-                        # Color mapping
-                        color_emoji_map = {
-                            "red": "🔴",
-                            "orange": "🟡",
-                            "green": "🟢"
-                        }
-                        
                         # Large risk display
-                        st.markdown(f"""
-                        <div style='background-color: {risk_color}; padding: 30px; border-radius: 15px; text-align: center;'>
-                            <h1 style='color: white; margin: 0;'>{color_emoji_map.get(risk_color, '⚪')} {risk_level} RISK</h1>
-                            <h2 style='color: white; margin: 10px 0 0 0;'>Risk Score: {risk_score:.1%}</h2>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(
+                            RISK_HTML[risk_color].format(
+                                emoji=RISK_EMOJI.get(risk_color, '⚪'),
+                                level=risk_level,
+                                score=f"{risk_score:.1%}"
+                            ),
+                            unsafe_allow_html=True
+                        )
                         
                         st.markdown("")
                         
@@ -1375,41 +1799,20 @@ elif page == "🤖 Predictive Analytics":
                                 "Model Information": model_info
                             })
                         
-                        # Download prediction report
+                        # Download prediction report (body memoized per input/prediction)
                         report = f"""
 COVID-19 MORTALITY RISK PREDICTION REPORT
 ==========================================
 
 Prediction Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
-INPUT DATA:
------------
-Confirmed Cases: {confirmed:,}
-Deaths: {deaths:,}
-Recovered: {recovered:,}
-Active: {active:,}
-WHO Region: {who_region}
-
-PREDICTION RESULTS:
--------------------
-Risk Level: {risk_level}
-Risk Score: {risk_score:.3f} ({risk_score*100:.1f}%)
-Model Confidence: {prediction['confidence']:.3f} ({prediction['confidence']*100:.1f}%)
-Current Mortality Rate: {mortality_rate:.2f}%
-
-RECOMMENDATION:
----------------
-{recommendation}
-
-MODEL INFORMATION:
-------------------
-Algorithm: Random Forest Classifier
-Training Accuracy: {model_info.get('training_accuracy', 0):.3f}
-Features Used: {model_info.get('features_count', 0)}
-
-Generated by: COVID-19 Health Informatics Dashboard
-ITENAS Health Informatics - IFB-499 Informatika Terapan
-                        """
+""" + build_report(
+                            (confirmed, deaths, recovered, active, who_region),
+                            (
+                                risk_level, risk_score, prediction['confidence'], mortality_rate, recommendation,
+                                model_info.get('training_accuracy', 0), model_info.get('features_count', 0)
+                            )
+                        )
                         
                         st.download_button(
                             label="📥 Download Prediction Report",
@@ -1427,6 +1830,65 @@ ITENAS Health Informatics - IFB-499 Informatika Terapan
             except requests.exceptions.RequestException as e:
                 st.error(f"❌ Connection error: {str(e)}")
                 st.info("Ensure Flask API is running on http://127.0.0.1:5000")
+    
+    # ===== BATCH SCENARIO PREDICTION =====
+    scenarios = st.session_state.get('scenarios', [])
+    
+    if scenarios:
+        st.markdown("---")
+        st.subheader(f"📋 What-if Scenarios ({len(scenarios)})")
+        
+        st.dataframe(pd.DataFrame(scenarios), use_container_width=True, hide_index=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            predict_all = st.button("🔮 Predict All Scenarios", type="primary", use_container_width=True)
+        
+        with col2:
+            if st.button("🗑️ Clear Scenarios", use_container_width=True):
+                st.session_state['scenarios'] = []
+                st.rerun()
+        
+        if predict_all:
+            with st.spinner(f"🤖 Running ML model on {len(scenarios)} scenarios..."):
+                try:
+                    # One POST and one predict_proba call for all scenarios
+                    response = SESSION.post(
+                        f"{API_ROOT}/api/predictions/mortality/batch",
+                        data=orjson.dumps({"inputs": scenarios}),
+                        headers=JSON_HEADERS,
+                        timeout=10
+                    )
+                    
+                    if response.status_code == 200:
+                        batch_data = orjson.loads(response.content)
+                        
+                        if batch_data.get('status') == 'success':
+                            results_df = pd.DataFrame([
+                                {
+                                    'Scenario': i + 1,
+                                    'Confirmed': inputs['confirmed'],
+                                    'Deaths': inputs['deaths'],
+                                    'Risk Level': pred['risk_level'],
+                                    'Risk Score': f"{pred['risk_score']:.1%}",
+                                    'Confidence': f"{pred['confidence']:.1%}",
+                                    'Mortality Rate (%)': round(pred['mortality_rate'], 2)
+                                }
+                                for i, (inputs, pred) in enumerate(zip(scenarios, batch_data['predictions']))
+                            ])
+                            
+                            st.success(f"✅ Predicted {batch_data['count']} scenarios")
+                            st.dataframe(results_df, use_container_width=True, hide_index=True)
+                        else:
+                            st.error(f"❌ Prediction failed: {batch_data.get('message', 'Unknown error')}")
+                    
+                    else:
+                        st.error(f"❌ API Error {response.status_code}: {response.text}")
+                
+                except requests.exceptions.RequestException as e:
+                    st.error(f"❌ Connection error: {str(e)}")
+                    st.info("Ensure Flask API is running on http://127.0.0.1:5000")
 
 
 # ==============================
@@ -1634,7 +2096,7 @@ elif page == "🔐 Security Demo":
         if st.button("🔐 Test API Access with Selected Role", type="primary"):
             with st.spinner(f"Testing access as {selected_role}..."):
                 try:
-                    response = requests.get(
+                    response = SESSION.get(
                         f"{API_ROOT}/api/security/test-rbac",
                         headers={'X-API-Key': api_key},
                         timeout=5
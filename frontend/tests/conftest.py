@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Helper modules are imported by streamlit_app.py as top-level modules (run from frontend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+"""
+Tests for the downsampled time series figure helpers
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+go = pytest.importorskip("plotly.graph_objects")
+
+from _timeseries import MAX_PLOT_POINTS, new_timeseries_figure, add_timeseries_trace
+
+
+def _series(n):
+    x = pd.date_range("2020-01-22", periods=n, freq="D")
+    y = np.arange(n, dtype=np.int64)
+    return x, y
+
+
+@pytest.mark.parametrize("n", [188, 5000])
+def test_bar_trace_gets_explicit_xy(n):
+    x, y = _series(n)
+    fig = new_timeseries_figure()
+
+    add_timeseries_trace(fig, go.Bar(name="Daily Confirmed"), x, y)
+
+    bar = fig.data[0]
+    assert bar.type == "bar"
+    assert bar.x is not None and bar.y is not None
+    assert 0 < len(bar.x) == len(bar.y)
+    if n <= MAX_PLOT_POINTS:
+        assert len(bar.y) == n
+
+
+def test_bar_trace_downsampled_with_tsdownsample():
+    pytest.importorskip("tsdownsample")
+    x, y = _series(5000)
+    fig = new_timeseries_figure()
+
+    add_timeseries_trace(fig, go.Bar(name="Daily Confirmed"), x, y)
+
+    assert len(fig.data[0].y) <= MAX_PLOT_POINTS
+
+
+def test_scatter_trace_on_resampler_uses_hf_data():
+    pytest.importorskip("plotly_resampler")
+    x, y = _series(5000)
+    fig = new_timeseries_figure()
+
+    add_timeseries_trace(fig, go.Scattergl(name="confirmed", mode="lines"), x, y)
+
+    assert len(fig.hf_data) == 1
+    assert len(fig.data[0].y) <= MAX_PLOT_POINTS